@@ -21,10 +21,15 @@ setuptools.setup(
     },
     install_requires=[
         "beautifulsoup4>=4.9.3",
+        "diskcache",
+        "lxml",
         "requests>=2.31.0",
         "requests[socks]",
         "librecaptcha"
     ],
+    extras_require={
+        "http2": ["httpx[http2,socks]>=0.28.0"],
+    },
     python_requires=">=3.6",
     license='BSD 3-Clause "New" or "Revised" License',
     keywords="python google search googlesearch",
@@ -1,18 +1,25 @@
 # Standard Python libraries.
+import asyncio
+import codecs
+import functools
+import gzip
+import itertools
 import logging
-import os
 import queue
 import random
+import re
+import sys
 import threading
 import time
 import urllib
-from datetime import datetime
-import sys
+from datetime import date, datetime
+from pathlib import Path
 
 # Third party Python libraries.
-from bs4 import BeautifulSoup
+import diskcache
+import lxml.etree
+import lxml.html
 import requests
-import librecaptcha
 
 
 __version__ = "2.0.0"
@@ -34,24 +41,65 @@ ROOT_LOGGER = logging.getLogger("yagooglesearch")  # ISO 8601 datetime format by
 # console_handler.setFormatter(LOG_FORMATTER)
 # ROOT_LOGGER.addHandler(console_handler)
 
-install_folder = os.path.abspath(os.path.split(__file__)[0])
+install_folder = Path(__file__).resolve().parent
+user_agents_file = install_folder / "user_agents.txt"
+result_languages_file = install_folder / "result_languages.txt"
 
-try:
-    user_agents_file = os.path.join(install_folder, "user_agents.txt")
-    with open(user_agents_file, "r") as fh:
-        USER_AGENTS_LIST = [_.strip() for _ in fh.readlines()]
-except Exception:
-    USER_AGENTS_LIST = ["Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.131 Safari/537.36"]
+
+# The resource files are only read (once) when they are actually needed, e.g. not if a user_agent is provided.
+@functools.lru_cache(maxsize=None)
+def _user_agents():
+    try:
+        return tuple(_ for _ in user_agents_file.read_text().splitlines() if _.strip())
+    except Exception:
+        return ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.131 Safari/537.36",)
 
 
 # Load the list of result languages.  Compiled by viewing the source code at https://www.google.com/advanced_search for the supported languages.
-try:
-    result_languages_file = os.path.join(install_folder, "result_languages.txt")
-    with open(result_languages_file, "r") as fh:
-        RESULTS_LANGUAGES_DICT = {_.split("=")[0].strip():_.split("=")[1].strip() for _ in fh.readlines()}
-except Exception as e:
-    print(f"There was an issue loading the result languages file.  Exception: {e}")
-    RESULTS_LANGUAGES_DICT = []
+@functools.lru_cache(maxsize=None)
+def _result_languages():
+    try:
+        text = result_languages_file.read_text()
+        return dict(map(str.strip, _.partition("=")[::2]) for _ in text.splitlines() if "=" in _)
+    except Exception as e:
+        print(f"There was an issue loading the result languages file.  Exception: {e}")
+        return {}
+
+
+@functools.lru_cache(maxsize=64)
+def _build_static_url(url_home, query, safe, hl, lr, cr, tbs, extra_items):
+    """Build the part of a search URL that is the same for all pages of a search, i.e. everything but start and num."""
+    # Unset parameters are left out, everything else (including the raw query and the extra parameters) is URL encoded by
+    # urlencode.
+    base_params = {"q": query, "safe": safe, "hl": hl, "lr": lr, "cr": cr, "filter": "0", "tbs": tbs}
+    params = [(key, value) for key, value in base_params.items() if value] + list(extra_items)
+    return f"{url_home}/search?" + urllib.parse.urlencode(params)
+
+
+_thread_local = threading.local()
+
+
+def _html_parser():
+    """Parser for result pages, which the page getter hands over as UTF-8 bytes.  Comments and processing instructions
+    are dropped while parsing, and the ids are not hashed into a lookup table (get_element_by_id uses XPath), so less of
+    the page ends up in memory.  lxml parsers must not be shared between threads, so each thread gets its own."""
+    parser = getattr(_thread_local, "html_parser", None)
+    if parser is None:
+        parser = _thread_local.html_parser = lxml.html.HTMLParser(
+            encoding="utf-8", remove_comments=True, remove_pis=True, collect_ids=False
+        )
+    return parser
+
+
+# Result links are sometimes wrapped in a Google redirect, with the actual target in the "q" or "url" GET parameter.
+# The patterns are matched against the redirect's query string only, so a "?q=" inside an unencoded target is ignored.
+_REDIR_PREFIXES = ("/url?", "http://www.google.com/url?", "https://www.google.com/url?")
+_REDIR_Q_RE = re.compile(r"(?:^|&)q=([^&#]+)")
+_REDIR_URL_RE = re.compile(r"(?:^|&)url=([^&#]+)")
+# Links that can't be absolute result URLs: fragments, bare queries, scripts and mail addresses.
+_NON_RESULT_PREFIXES = ("#", "?", "javascript:", "mailto:")
+# Any host containing "google" (www.google.com, images.google.com, googleusercontent.com, ...) is not a valid result.
+_GOOGLE_NETLOC_RE = re.compile("google", re.IGNORECASE)
 
 
 def get_tbs(from_date, to_date):
@@ -65,8 +113,12 @@ def get_tbs(from_date, to_date):
     :return: Dates encoded in tbs format.
     """
 
-    from_date = from_date.strftime("%m/%d/%Y")
-    to_date = to_date.strftime("%m/%d/%Y")
+    if not isinstance(from_date, date) or not isinstance(to_date, date):
+        raise TypeError("from_date and to_date must be datetime.date (or datetime.datetime) objects")
+
+    # Plain integer formatting, same result as strftime("%m/%d/%Y") without its format string and locale handling.
+    from_date = f"{from_date.month:02d}/{from_date.day:02d}/{from_date.year:04d}"
+    to_date = f"{to_date.month:02d}/{to_date.day:02d}/{to_date.year:04d}"
 
     formatted_tbs = f"cdr:1,cd_min:{from_date},cd_max:{to_date}"
 
@@ -76,7 +128,24 @@ def get_tbs(from_date, to_date):
 class SearchClient:
 
     # Used later to ensure there are not any URL parameter collisions.
-    URL_PARAMETERS = ("btnG", "cr", "hl", "num", "q", "safe", "start", "tbs", "lr")
+    URL_PARAMETERS = frozenset(("btnG", "cr", "hl", "num", "q", "safe", "start", "tbs", "lr"))
+
+    # Compiled once, evaluated by lxml in C for every result page.
+    ANCHORS_XPATH = lxml.etree.XPath(".//a[@href]")
+    # Without verbose_output only the hrefs are needed: plain strings, no element proxy per anchor.
+    HREFS_XPATH = lxml.etree.XPath(".//a/@href", smart_strings=False)
+    DESCRIPTION_XPATH = lxml.etree.XPath(".//div[contains(@class, 'VwiC3b') or contains(@class, 'lEBKkf')]//text()")
+
+    # Labels of the "accept all" button of Google's cookie consent form.  TODO other languages
+    CONSENT_ACCEPT_LABELS = frozenset(
+        ("Accept all", "Alle akzeptieren", "Tout accepter", "Aceptar todo", "Accetta tutto", "Alles accepteren")
+    )
+
+    # How long a result page stays in the on-disk cache (if cache_dir is given).
+    CACHE_EXPIRATION_IN_SECONDS = 60 * 60
+
+    # Upper bound for the HTTP 429 cool off time, however often HTTP 429s are detected.
+    HTTP_429_MAX_COOL_OFF_TIME_IN_MINUTES = 6 * 60
 
     def __init__(
         self,
@@ -90,13 +159,16 @@ class SearchClient:
         user_agent=None,
         yagooglesearch_manages_http_429s=True,
         http_429_cool_off_time_in_minutes=60,
-        http_429_cool_off_factor=1.1,
+        http_429_cool_off_factor=3,
         proxy="",
         verify_ssl=True,
         verbosity=5,
         verbose_output=False,
         google_exemption=None,
         global_kill_event=None,
+        cache_dir=None,
+        http2=False,
+        http_429_max_retries=None,
     ):
         """
         SearchClient
@@ -114,9 +186,10 @@ class SearchClient:
         :param str user_agent: Hard-coded user agent for the HTTP requests.
         :param bool yagooglesearch_manages_http_429s: Determines if yagooglesearch will handle HTTP 429 cool off and
            retries.  Disable if you want to manage HTTP 429 responses.
-        :param int http_429_cool_off_time_in_minutes: Minutes to sleep if an HTTP 429 is detected.
-        :param float http_429_cool_off_factor: Factor to multiply by http_429_cool_off_time_in_minutes for each HTTP 429
-            detected.
+        :param int http_429_cool_off_time_in_minutes: Minimum minutes to sleep if an HTTP 429 is detected.
+        :param float http_429_cool_off_factor: For each HTTP 429 detected, the cool off time is a random value between
+            http_429_cool_off_time_in_minutes and this factor times the previous cool off time (initially
+            http_429_cool_off_time_in_minutes).
         :param str proxy: HTTP(S) or SOCKS5 proxy to use.
         :param bool verify_ssl: Verify the SSL certificate to prevent traffic interception attacks.  Defaults to True.
             This may need to be disabled in some HTTPS proxy instances.
@@ -124,6 +197,12 @@ class SearchClient:
         :param bool verbose_output: False (only URLs) or True (rank, title, description, and URL).  Defaults to False.
         :param str google_exemption: Google cookie exemption string.  This is a string that Google uses to allow certain
             google searches. Defaults to None.
+        :param str cache_dir: Directory for an on-disk cache of retrieved result pages, so repeated searches don't hit
+            Google again.  Defaults to None (no caching).
+        :param bool http2: Use HTTP/2 (through httpx, install with the "http2" extra) instead of HTTP/1.1 with requests.
+            Defaults to False.
+        :param int http_429_max_retries: Number of cool offs and retries after HTTP 429s before giving up on a page and
+            returning "HTTP_429_DETECTED" as if yagooglesearch_manages_http_429s was False.  Defaults to None (no limit).
 
         :rtype: List of str
         :return: List of URLs found or list of {"rank", "title", "description", "url"}
@@ -138,15 +217,19 @@ class SearchClient:
         self.default_user_agent = user_agent
         self.yagooglesearch_manages_http_429s = yagooglesearch_manages_http_429s
         self.http_429_cool_off_time_in_minutes = http_429_cool_off_time_in_minutes
+        self.http_429_base_cool_off_time_in_minutes = http_429_cool_off_time_in_minutes
         self.http_429_cool_off_factor = http_429_cool_off_factor
+        self.http_429_max_retries = http_429_max_retries
         self.proxy = proxy
         self.verify_ssl = verify_ssl
         self.verbosity = verbosity
         self.verbose_output = verbose_output
         self.google_exemption = google_exemption
+        self.cache = diskcache.Cache(cache_dir) if cache_dir else None
         self.url_home = f"https://www.google.{self.tld}"
 
         self.global_kill_event = global_kill_event or threading.Event()
+        self.last_request_time = 0.0  # time.monotonic() of the last HTTP request, see sleep_against_429
         self.query_kill_events = ThreadSafeDict()
         self.page_results = ThreadSafeDict()
         self.getpage_p1_qu, self.getpage_p2_qu, self.getpage_p3_qu = queue.Queue(), queue.Queue(), queue.Queue()
@@ -158,19 +241,32 @@ class SearchClient:
 
         # Argument checks.
         if self.lang_result is not None:
-            if self.lang_result not in RESULTS_LANGUAGES_DICT:
+            result_languages = _result_languages()
+            if self.lang_result not in result_languages:
                 ROOT_LOGGER.error(
                     f"{self.lang_result} is not a valid language result.  See {result_languages_file} for the list of valid "
                     'languages.  Setting lang_result to "lang_en".'
                 )
                 self.lang_result = "lang_en"
-            self.lang_result = RESULTS_LANGUAGES_DICT[self.lang_result]
-
-        # Populate cookies with GOOGLE_ABUSE_EXEMPTION if it is provided.  Otherwise, initialize empty. Will be updated with each request in get_page().
-        self.cookies = {"GOOGLE_ABUSE_EXEMPTION": self.google_exemption} if self.google_exemption else {}
+            self.lang_result = result_languages.get(self.lang_result)  # None (no lr parameter) if the file failed to load.
 
         self.proxy_dict = {"http": self.proxy, "https": self.proxy} if self.proxy else {}
 
+        # One session for all requests, so the connection to Google is kept alive between pages and the session's cookie
+        # jar takes care of the cookies returned with each response (including redirects).
+        # httpx.Client offers the same get/post/headers/cookies interface that is used here.
+        if http2:
+            import httpx  # Optional dependency, only needed for HTTP/2.
+
+            self.session = httpx.Client(http2=True, proxy=self.proxy or None, verify=self.verify_ssl, follow_redirects=True)
+        else:
+            self.session = requests.Session()
+            self.session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
+        # Populate cookies with GOOGLE_ABUSE_EXEMPTION if it is provided.
+        if self.google_exemption:
+            self.session.cookies.set("GOOGLE_ABUSE_EXEMPTION", self.google_exemption)
+
         if not self.verify_ssl:  # Suppress warning messages if verify_ssl is disabled.
             requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
 
@@ -179,6 +275,12 @@ class SearchClient:
         ROOT_LOGGER.info("yagooglesearch initialized.")
 
 
+    def close(self):
+        """Close the HTTP session and its pooled connections to Google, and the on-disk cache if there is one."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
     def reset_search(self, firsttime=False, new_ua=True):
         if new_ua:
             self.assign_user_agent(self.default_user_agent)
@@ -189,33 +291,41 @@ class SearchClient:
             self.last_webcalls = self.webcalls = 1
 
     def get_url(self, query, start=None, num=None, extra_params=None):
-        query = urllib.parse.quote_plus(query)
-        url = (
-                self.url_home + f"/search?q={query}&safe={self.safe}&"
-                + (f"hl={self.lang_html_ui}&" if self.lang_html_ui else "")
-                + (f"lr={self.lang_result}&" if self.lang_result is not None else "")
-                + (f"cr={self.country}&" if self.country is not None else "")
-                + f"filter=0&tbs={self.tbs}"
+        # Only start and num change from page to page, the rest of the URL is built once per search.
+        url = _build_static_url(
+            self.url_home,
+            query,
+            self.safe,
+            self.lang_html_ui,
+            self.lang_result,
+            self.country,
+            self.tbs,
+            # Values become part of the lru_cache key, so they must be hashable.  urlencode would call str() on them
+            # anyway (except on bytes, which it quotes as they are).
+            tuple(
+                (key, value if isinstance(value, (str, bytes)) else str(value)) for key, value in (extra_params or {}).items()
+            ),
         )
         url += (f"&btnG=Google+Search" if start in [None, 0] else f"&start={start}")
         if num is not None:
             url += f"&num={num}"
 
-        extra_params = extra_params or {}
-        for builtin_param in self.URL_PARAMETERS: # Check extra_params for overlapping parameters.
-            if builtin_param in extra_params.keys():
-                raise ValueError(f'GET parameter "{builtin_param}" is overlapping with the built-in GET parameter')
-        for key, value in extra_params.items(): # Append extra GET parameters to the URL.  The keys and values are not URL encoded.
-            url += f"&{key}={value}"
-
         return url
 
+    def check_extra_params(self, extra_params):
+        """Raise a ValueError if any of the extra GET parameters collides with a built-in GET parameter."""
+        overlapping = self.URL_PARAMETERS & extra_params.keys()
+        if overlapping:
+            raise ValueError(f'GET parameter(s) {", ".join(sorted(overlapping))} overlapping with the built-in GET parameters')
+
     def assign_user_agent(self, user_agent=None):
-        self.user_agent = user_agent or random.choice(USER_AGENTS_LIST)
+        self.user_agent = user_agent or random.choice(_user_agents())
+        self.session.headers["User-Agent"] = self.user_agent
 
     @property
     def headers(self):
-        return {"User-Agent": self.user_agent}
+        # The session's headers are sent with every request, no need to build a new dict each time.
+        return self.session.headers
 
     def filter_search_result_urls(self, link):
         """Filter links found in the Google result pages HTML code.  Valid results are absolute URLs not pointing to a
@@ -228,21 +338,22 @@ class SearchClient:
 
         ROOT_LOGGER.debug(f"pre filter_search_result_urls() link: {link}")
 
+        # Cheap prefix tests first: most anchors on a result page are Google-internal relative links, no need to parse them.
+        if not link or link.startswith(_NON_RESULT_PREFIXES) or (link[0] == "/" and not link.startswith(("/url?", "//"))):
+            ROOT_LOGGER.debug(f"Excluding relative or non-HTTP link: {link}")
+            return None
+
         try:
             # Extract URL from parameter.  Once in a while the full "http://www.google.com/url?" exists instead of just
             # "/url?".  After a re-run, it disappears and "/url?" is present...might be a caching thing?
-            if link.startswith("/url?") or link.startswith("http://www.google.com/url?"):
-                urlparse_object = urllib.parse.urlparse(link, scheme="http")
+            if link.startswith(_REDIR_PREFIXES):
+                # The "q" key exists most of the time.  Sometimes, only the "url" key does though.
+                params = link.partition("?")[2]
+                match = _REDIR_Q_RE.search(params) or _REDIR_URL_RE.search(params)
+                link = urllib.parse.unquote_plus(match.group(1))
 
-                # The "q" key exists most of the time.
-                try:
-                    link = urllib.parse.parse_qs(urlparse_object.query)["q"][0]
-                # Sometimes, only the "url" key does though.
-                except KeyError:
-                    link = urllib.parse.parse_qs(urlparse_object.query)["url"][0]
-
-            # Create a urlparse object.
-            urlparse_object = urllib.parse.urlparse(link, scheme="http")
+            # Split the actual target, only its netloc is needed.
+            urlparse_object = urllib.parse.urlsplit(link, scheme="http")
 
             # Exclude urlparse objects without a netloc value.
             if not urlparse_object.netloc:
@@ -252,7 +363,7 @@ class SearchClient:
                 link = None
 
             # TODO: Generates false positives if specifying an actual Google site, e.g. "site:google.com fiber".
-            if urlparse_object.netloc and ("google" in urlparse_object.netloc.lower()):
+            if urlparse_object.netloc and _GOOGLE_NETLOC_RE.search(urlparse_object.netloc):
                 ROOT_LOGGER.debug(f'Excluding URL because it contains "google": {link}')
                 link = None
 
@@ -264,167 +375,187 @@ class SearchClient:
         return link
 
     def http_429_detected(self):
-        """Increase the HTTP 429 cool off period."""
-
-        new_http_429_cool_off_time_in_minutes = round(self.http_429_cool_off_time_in_minutes * self.http_429_cool_off_factor, 2)
+        """Draw the next HTTP 429 cool off period with decorrelated jitter: a random value between the initial cool off
+        time and http_429_cool_off_factor times the previous one, capped at HTTP_429_MAX_COOL_OFF_TIME_IN_MINUTES.  It
+        is drawn before every cool off, including the first, so several clients that got blocked at the same time don't
+        retry in lock-step.  The new value may also be shorter than the previous one."""
+
+        new_http_429_cool_off_time_in_minutes = round(
+            min(
+                self.HTTP_429_MAX_COOL_OFF_TIME_IN_MINUTES,
+                random.uniform(
+                    self.http_429_base_cool_off_time_in_minutes,
+                    self.http_429_cool_off_time_in_minutes * self.http_429_cool_off_factor,
+                ),
+            ),
+            2,
+        )
         ROOT_LOGGER.info(
-            f"Increasing HTTP 429 cool off time by a factor of {self.http_429_cool_off_factor}, "
-            f"from {self.http_429_cool_off_time_in_minutes} minutes to {new_http_429_cool_off_time_in_minutes} minutes"
+            f"Changing HTTP 429 cool off time from {self.http_429_cool_off_time_in_minutes} minutes to "
+            f"{new_http_429_cool_off_time_in_minutes} minutes"
         )
         self.http_429_cool_off_time_in_minutes = new_http_429_cool_off_time_in_minutes
 
     def debug_requests_response(self, response):
         ROOT_LOGGER.debug(f"    status_code: {response.status_code}")
         ROOT_LOGGER.debug(f"    headers: {self.headers}")
-        ROOT_LOGGER.debug(f"    cookies: {self.cookies}")
+        ROOT_LOGGER.debug(f"    cookies: {self.session.cookies}")
         ROOT_LOGGER.debug(f"    proxy: {self.proxy}")
         ROOT_LOGGER.debug(f"    verify_ssl: {self.verify_ssl}")
 
-    def request(self, url, data=None, timeout=15, type="GET", additional_headers=None, update_cookies=True):
+    def request(self, url, data=None, timeout=15, type="GET", additional_headers=None):
         ROOT_LOGGER.info(f"Requesting URL: {url}")
-        headers = self.headers if additional_headers is None else {**self.headers, **additional_headers}
 
+        # User-Agent and cookies are taken from the session, additional_headers are merged in.  For requests, proxies and
+        # SSL verification are passed with every call: set on the Session, they would lose against HTTP(S)_PROXY and
+        # REQUESTS_CA_BUNDLE from the environment (and verify_ssl may be changed after instantiation).  httpx.Client
+        # already prefers its explicit proxy and verify arguments over the environment.
+        kwargs = {"proxies": self.proxy_dict, "verify": self.verify_ssl} if isinstance(self.session, requests.Session) else {}
         if type == "POST":
-            response = requests.post(url,
-                                     data=data or {},
-                                     proxies=self.proxy_dict,
-                                     headers=headers,
-                                     cookies=self.cookies,
-                                     timeout=timeout,
-                                     verify=self.verify_ssl)
+            response = self.session.post(url, data=data or {}, headers=additional_headers, timeout=timeout, **kwargs)
         elif type == "GET":
             assert not data
-            response = requests.get(url,
-                                    proxies=self.proxy_dict,
-                                    headers=headers,
-                                    cookies=self.cookies,
-                                    timeout=timeout,
-                                    verify=self.verify_ssl)
+            response = self.session.get(url, headers=additional_headers, timeout=timeout, **kwargs)
         else:
             raise NotImplementedError()
 
+        # Google serves UTF-8.  Without a charset in the Content-Type header, requests would otherwise decode text/html as
+        # ISO-8859-1 (and run charset detection for other types).
+        if "charset=" not in response.headers.get("Content-Type", "").lower():
+            response.encoding = "utf-8"
+
         self.webcalls = getattr(self, "webcalls", 0) + 1  # we use this to check if we did actually access the web or just the cache
+        self.last_request_time = time.monotonic()
         self.debug_requests_response(response)
-        if update_cookies:
-            self.update_cookies(response.cookies)
-            for history_elem in response.history:
-                self.update_cookies(history_elem.cookies)
         return response
 
-    def update_cookies(self, cookies):
-        if not self.cookies:
-            self.cookies = cookies
-        else:
-            self.cookies.update(cookies)
-
-    def check_cookie_banner(self, response):
-        # Click cookie-banner if it exists
-        soup = BeautifulSoup(response.text, 'html.parser')
-        if soup.find("form", {"action": "https://consent.google.de/save"}):
-            ROOT_LOGGER.warning("Sending another request to get rid of the cookie-banner")
-            cookie_forms = soup.find_all("form", {"action": f"https://consent.google.{self.tld}/save"})
-            if cookie_forms:
-                form_buttons = [[j.attrs["value"] for j in i.children if j.get("type") == "submit"] for i in cookie_forms]
-                if any((accept := [i and i[0] in ["Accept all", "Alle akzeptieren"] for i in form_buttons])): # TODO other languages
-                    accept_form = cookie_forms[accept.index(True)]
-                    form_inputs = {i.attrs["name"]: i.attrs["value"]
-                                   for i in accept_form.children
-                                   if i.name == "input" and i.attrs["type"] == "hidden"}
-                    response = self.request(accept_form.attrs["action"], data=form_inputs, type="POST")
+    @staticmethod
+    def parse_forms(response):
+        """Parse only the forms and divs of a consent or captcha page, which is all check_cookie_banner and
+        solve_recaptcha look at."""
+        from bs4 import BeautifulSoup, SoupStrainer  # Only needed on the rare consent and captcha pages.
+
+        return BeautifulSoup(response.text, "lxml", parse_only=SoupStrainer(["form", "div"]))
+
+    def check_cookie_banner(self, response, soup=None):
+        # Click cookie-banner if it exists.  Cheap substring test first, so normal pages are not parsed for nothing.
+        if soup is None:
+            if b"consent.google." not in response.content:
+                return response
+            soup = self.parse_forms(response)
+        for form in soup.select(f'form[action="https://consent.google.{self.tld}/save"]'):
+            button = form.select_one("[type=submit][value]")
+            if button is not None and button["value"] in self.CONSENT_ACCEPT_LABELS:
+                ROOT_LOGGER.warning("Sending another request to get rid of the cookie-banner")
+                form_inputs = {i["name"]: i.get("value", "") for i in form.select("input[type=hidden][name]")}
+                return self.request(form["action"], data=form_inputs, type="POST")
         return response
 
-    def set_consent_cookie(self, response):
+    def set_consent_cookie(self):
         # Google throws up a consent page for searches sourcing from a European Union country IP location.
         # See https://github.com/benbusby/whoogle-search/issues/311
-        try:
-            if response.cookies["CONSENT"].startswith("PENDING+"):
-                ROOT_LOGGER.warning(
-                    "Looks like your IP address is sourcing from a European Union location...your search results may "
-                    "vary, but I'll try and work around this by updating the cookie."
-                )
-
-                # Convert the cookiejar data structure to a Python dict.
-                cookie_dict = self.cookies if isinstance(self.cookies, dict) else requests.utils.dict_from_cookiejar(self.cookies)
-
-                # Pull out the random number assigned to the response cookie.
-                number = cookie_dict["CONSENT"].split("+")[1]
-
-                # See https://github.com/benbusby/whoogle-search/pull/320/files
-                """
-                Attempting to dissect/breakdown the new cookie response values.
-
-                YES - Accept consent
-                shp - ?
-                gws - "server:" header value returned from original request.  Maybe Google Workspace plus a build?
-                fr - Original tests sourced from France.  Assuming this is the country code.  Country code was changed
-                    to .de and it still worked.
-                F - FX agrees to tracking. Modifying it to just F seems to consent with "no" to personalized stuff.
-                    Not tested, solely based off of
-                    https://github.com/benbusby/whoogle-search/issues/311#issuecomment-841065630
-                XYZ - Random 3-digit number assigned to the first response cookie.
-                """
-                now = datetime.now()
-                consent_cookie = 'YES+cb.{:d}{:02d}{:02d}-17-p0.de+F+{}'.format(now.year, now.month, now.day, number)
-                # f"YES+shp.gws-20211108-0-RC1.fr+F+{number}"
-                self.cookies["CONSENT"] = consent_cookie
-
-                ROOT_LOGGER.debug(f"Updating cookie to: {self.cookies}")
-
-        # "CONSENT" cookie does not exist.
-        except KeyError:
-            pass
-
-    def solve_recaptcha(self, response, url):
-        soup = BeautifulSoup(response.text, 'html.parser')
-        sys.setrecursionlimit(3000)
-        sitekey = soup.find("div", {"class": "g-recaptcha"}).attrs["data-sitekey"]
+        # The session's jar also holds cookies set by redirects, which response.cookies of the final response lacks.
+        consent = self.session.cookies.get("CONSENT", domain=f".google.{self.tld}") or ""
+        if consent.startswith("PENDING+"):
+            ROOT_LOGGER.warning(
+                "Looks like your IP address is sourcing from a European Union location...your search results may "
+                "vary, but I'll try and work around this by updating the cookie."
+            )
+
+            # Pull out the random number assigned to the response cookie.
+            number = consent.split("+")[1]
+
+            # See https://github.com/benbusby/whoogle-search/pull/320/files
+            """
+            Attempting to dissect/breakdown the new cookie response values.
+
+            YES - Accept consent
+            shp - ?
+            gws - "server:" header value returned from original request.  Maybe Google Workspace plus a build?
+            fr - Original tests sourced from France.  Assuming this is the country code.  Country code was changed
+                to .de and it still worked.
+            F - FX agrees to tracking. Modifying it to just F seems to consent with "no" to personalized stuff.
+                Not tested, solely based off of
+                https://github.com/benbusby/whoogle-search/issues/311#issuecomment-841065630
+            XYZ - Random 3-digit number assigned to the first response cookie.
+            """
+            now = datetime.now()
+            consent_cookie = 'YES+cb.{:d}{:02d}{:02d}-17-p0.de+F+{}'.format(now.year, now.month, now.day, number)
+            # f"YES+shp.gws-20211108-0-RC1.fr+F+{number}"
+            # Overwrite the pending cookie in the session's jar (same name, domain and path).
+            self.session.cookies.set("CONSENT", consent_cookie, domain=f".google.{self.tld}")
+
+            ROOT_LOGGER.debug(f"Updating cookie to: {self.session.cookies}")
+
+    def solve_recaptcha(self, response, url, soup=None):
+        soup = soup if soup is not None else self.parse_forms(response)
+        sitekey = soup.select_one("div.g-recaptcha")["data-sitekey"]
+        import librecaptcha  # Heavy import, only needed when Google actually shows a captcha.
+
+        # librecaptcha parses Google's minified reCAPTCHA JavaScript with a recursive-descent parser (esprima), which
+        # needs more than the default recursion limit.  Only ever raised, other code may rely on a higher limit.
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), 3000))
         token = librecaptcha.get_token(sitekey, url, self.user_agent, gui=False)
-        sys.setrecursionlimit(1000)
-        captcha_form = soup.find("form", {"id": "captcha-form"})
-        form_inputs = {i.attrs["name"]: i.attrs["value"] for i in captcha_form.children if i.name == "input" and i.attrs["type"] == "hidden"}
+        captcha_form = soup.select_one("form#captcha-form")
+        form_inputs = {i["name"]: i.get("value", "") for i in captcha_form.select("input[type=hidden][name]")}
         # del form_inputs["q"]
         form_inputs["g-recaptcha-response"] = token
         # https://developers.google.com/recaptcha/docs/verify: the response token is "a string argument to your callback function if data-callback is specified in either the g-recaptcha tag attribute"
         captcha_url = "https://www.google.com/sorry/index"
         referer = captcha_url + "?continue=" + "https:"+urllib.parse.quote(form_inputs["continue"][6:]) + f"&q={form_inputs['q']}"
-        print("Referer:", referer)
-        print("Form-Inputs:", form_inputs)
-        response2 = self.request(captcha_url, data=form_inputs, additional_headers={"Referer": referer}) # TODO don't update cookies?
-        print()
+        ROOT_LOGGER.debug(f"Submitting the captcha with Referer {referer} and form inputs {form_inputs}")
+        self.request(captcha_url, data=form_inputs, type="POST", additional_headers={"Referer": referer})
 
     def _get_page_mainthread(self, url):
         """
         Request the given URL and return the response page.
         :param str url: URL to retrieve.
-        :rtype: str
-        :return: Web page HTML retrieved for the given URL
+        :rtype: bytes
+        :return: UTF-8 encoded web page HTML retrieved for the given URL (or the string "HTTP_429_DETECTED")
         """
-        response = self.request(url)
-
-        # if this page displays a cookie-banner, follow the "accept" form and set the response-variable to the result of the following page instead
-        response = self.check_cookie_banner(response)
-        self.set_consent_cookie(response)
-        # TODO: do these both ^ in the first get-google.com call
+        for attempt in itertools.count():  # Retried after each HTTP 429 cool off, iteratively so repeated 429s don't grow the stack.
+            response = self.request(url)
+            # Consent and captcha pages are parsed once, for both check_cookie_banner and solve_recaptcha.
+            soup = self.parse_forms(response) if response.status_code == 429 or b"consent.google." in response.content else None
+
+            # if this page displays a cookie-banner, follow the "accept" form and set the response-variable to the result of the following page instead
+            consent_response = self.check_cookie_banner(response, soup) if soup is not None else response
+            if consent_response is not response:
+                response, soup = consent_response, None
+            self.set_consent_cookie()
+            # TODO: do these both ^ in the first get-google.com call
+
+            if response.status_code == 200:
+                # The result page parser expects UTF-8 (what Google serves), otherwise it would fall back to Latin-1 for
+                # pages without a <meta> charset.  Only pages declared with another charset need to be re-encoded.
+                try:
+                    if codecs.lookup(response.encoding).name == "utf-8":
+                        return response.content
+                except LookupError:
+                    return response.content
+                return response.text.encode("utf-8")
+            if response.status_code != 429:
+                ROOT_LOGGER.error(f"HTML response code: {response.status_code}")
+                return b""
 
-        html = ""
-        if response.status_code == 200:
-            html = response.text
-        elif response.status_code == 429:
             ROOT_LOGGER.warning("Google is blocking your IP for making too many requests in a specific time period.")
-            self.solve_recaptcha(response, url)
+            self.solve_recaptcha(response, url, soup)
             # TODO: this ^ only optional and if interactive and ...
             if not self.yagooglesearch_manages_http_429s:
                 # Calling script does not want yagooglesearch to handle HTTP 429 cool off and retry.  Just return a notification string.
                 ROOT_LOGGER.info("Since yagooglesearch_manages_http_429s=False, yagooglesearch is done.")
                 return "HTTP_429_DETECTED"
-            ROOT_LOGGER.info(f"Sleeping for {self.http_429_cool_off_time_in_minutes} minutes...")
-            time.sleep(self.http_429_cool_off_time_in_minutes * 60) # TODO: do the loop that allows for kill_event
+            if self.http_429_max_retries is not None and attempt >= self.http_429_max_retries:
+                ROOT_LOGGER.info(f"Giving up on this page after {attempt} HTTP 429 cool offs.")
+                return "HTTP_429_DETECTED"
+            # Retry-After (if sent as a number of seconds) is the minimum time to wait.
+            retry_after = response.headers.get("Retry-After", "")
+            retry_after_in_minutes = int(retry_after) / 60 if retry_after.isdigit() else 0
             self.http_429_detected()
-            html = self._get_page_mainthread(url)  # Try making the request again.
-        else:
-            ROOT_LOGGER.error(f"HTML response code: {response.status_code}")
-
-        return html
+            cool_off_time_in_minutes = max(self.http_429_cool_off_time_in_minutes, retry_after_in_minutes)
+            ROOT_LOGGER.info(f"Sleeping for {cool_off_time_in_minutes} minutes...")
+            if self.global_kill_event.wait(timeout=cool_off_time_in_minutes * 60):  # Returns early (True) on a global kill.
+                return b""
 
     def end_search(self, query, reason=None):
         """sets the kill-event for one specific query"""
@@ -437,41 +568,93 @@ class SearchClient:
         return self.query_kill_events[query].is_set()
 
     def pagegetter_threadfn(self):
-        while not self.globally_killed:  # TODO actually use globally_killed!
-            url, query = None, None
-            if not self.getpage_p1_qu.empty():
-                url, query = self.getpage_p1_qu.get()
-            elif not self.getpage_p2_qu.empty():
-                url, query = self.getpage_p2_qu.get()
-            elif not self.getpage_p3_qu.empty():
-                url, query = self.getpage_p3_qu.get()
+        while not self.globally_killed:
+            # Sleep before taking the next result page off the queues rather than after a request, so there is no delay
+            # after the last page of a search, and a first page enqueued while sleeping still goes first.  The home page
+            # (prio 1) is requested without delay.
+            if self.getpage_p1_qu.empty() and not (self.getpage_p2_qu.empty() and self.getpage_p3_qu.empty()):
+                self.sleep_against_429()
+                if self.globally_killed:  # No more requests once all searches are killed, not even the one slept for.
+                    break
+            url, query = self._dequeue_page()
             if url is not None and not self.search_ended(query):
                 self.page_results[url] = self._get_page_mainthread(url)
-                if url != self.url_home:
-                    self.sleep_against_429()
             time.sleep(0.01)
 
     def get_page(self, url, query=None, prio=2):
         """so the idea is that we call _get_page_mainthread only in one thread, and all calls to get_page will only enqueue their demand.
         We also want priorities however: self.url_home has no wait time, and first result-pages have priority over non-first (breadth-first basically)!"""
-        # TODO: ensure this is compatible with global kill_event!
-        addto = self.getpage_p1_qu if prio == 1 else self.getpage_p2_qu if prio == 2 else self.getpage_p3_qu
-        addto.put((url, query))
+        res = self._cached_page(url)
+        if res is not None:
+            return res
+        self._enqueue_page(url, query, prio)
         while url not in self.page_results:
-            if self.search_ended(query):
+            if self.globally_killed or self.search_ended(query):  # The page-getter thread stops on a global kill.
                 return
             time.sleep(0.01)
+        return self._collect_page(url)
+
+    async def aget_page(self, url, query=None, prio=2):
+        """Same as get_page, but waits for the page-getter thread without blocking the event loop, so many searches can
+        run concurrently in one thread.  Requests are still made one after another by the page-getter thread."""
+        res = self._cached_page(url)
+        if res is not None:
+            return res
+        self._enqueue_page(url, query, prio)
+        while url not in self.page_results:
+            if self.globally_killed or self.search_ended(query):
+                return
+            await asyncio.sleep(0.01)
+        return self._collect_page(url)
+
+    def _cached_page(self, url):
+        # The home page is never cached, requesting it is what gets us the initial cookies.
+        if self.cache is None or url == self.url_home:
+            return None
+        compressed = self.cache.get(url)
+        if compressed is None:
+            return None
+        try:
+            res = gzip.decompress(compressed)
+        except OSError:  # Not gzipped, e.g. written by an older version.  Treat it as a miss.
+            return None
+        ROOT_LOGGER.info(f"Using cached page for URL: {url}")
+        return res  # never reaches request(), so webcalls isn't increased and there is no sleep_against_429
+
+    def _enqueue_page(self, url, query, prio):
+        addto = self.getpage_p1_qu if prio == 1 else self.getpage_p2_qu if prio == 2 else self.getpage_p3_qu
+        addto.put((url, query))
+
+    def _dequeue_page(self):
+        for qu in (self.getpage_p1_qu, self.getpage_p2_qu, self.getpage_p3_qu):
+            if not qu.empty():
+                return qu.get()
+        return None, None
+
+    def _collect_page(self, url):
         res = self.page_results[url]
         del self.page_results[url]
+        if self.cache is not None and url != self.url_home and res and res != "HTTP_429_DETECTED":
+            # Result pages are mostly markup and scripts and shrink several times when gzipped.
+            self.cache.set(url, gzip.compress(res), expire=self.CACHE_EXPIRATION_IN_SECONDS)
         return res
 
-    def results_from_url(self, url, prev_results_ref=None, query=None, pagenum=0):
+    def results_from_url(self, url, seen_urls=None, query=None, pagenum=0):
         # need query to find its kill-event and pagenum for the get-page-priority
         # we want to cache this method, so ensure that this is side-effect free!
+        html = self.get_page(url, query=query, prio=2 if pagenum == 0 else 3)  # Breadth-First-Search!
+        return self._results_from_html(html, seen_urls, query)
+
+    async def aresults_from_url(self, url, seen_urls=None, query=None, pagenum=0):
+        html = await self.aget_page(url, query=query, prio=2 if pagenum == 0 else 3)  # Breadth-First-Search!
+        return self._results_from_html(html, seen_urls, query)
+
+    def _results_from_html(self, html, seen_urls, query):
+        # seen_urls is the set of URLs found in previous pages, it is only read here and updated by the caller.
         results = []
-        prev_results_ref = prev_results_ref or []
+        seen_urls = seen_urls or set()
+        page_urls = set()
 
-        html = self.get_page(url, query=query, prio=2 if pagenum == 0 else 3)  # Breadth-First-Search!
         if self.search_ended(query):
             return ["THIS_SEARCH_KILLED"]
 
@@ -480,117 +663,159 @@ class SearchClient:
             # this happens only if yagooglesearch_manages_429 == False
             return ["HTTP_429_DETECTED"]
 
-        soup = BeautifulSoup(html, "html.parser")
+        if not html:
+            return results
+        tree = lxml.html.fromstring(html, parser=_html_parser())
 
-        # Find all HTML <a> elements.
-        try:
-            anchors = soup.find(id="search").find_all("a")
-        except AttributeError:
+        # Find all HTML <a> elements with a href (or just their hrefs).
+        search = tree.get_element_by_id("search", None)
+        if search is None:
             # Sometimes (depending on the User-Agent) there is no id "search" in html response.
-            gbar = soup.find(id="gbar")
-            if gbar:
-                gbar.clear() # Remove links from the top bar.
-            anchors = soup.find_all("a")
+            for gbar in tree.xpath('//*[@id="gbar"]'):
+                gbar.drop_tree() # Remove links from the top bar.
+            search = tree
+        anchors = self.ANCHORS_XPATH(search) if self.verbose_output else self.HREFS_XPATH(search)
 
         for a in anchors:
-            try:
-                link = a["href"]
-            except KeyError:
-                ROOT_LOGGER.warning(f"No href for link: {a}")
-                continue
-
-            link = self.filter_search_result_urls(link) # Filter invalid links and links pointing to Google itself.
+            href = a.get("href") if self.verbose_output else a
+            link = self.filter_search_result_urls(href) # Filter invalid links and links pointing to Google itself.
             if not link:
                 continue
 
-            if self.verbose_output:
-                try:
-                    title = a.get_text() # Extract the URL title.
-                except Exception:
-                    ROOT_LOGGER.warning(f"No title for link: {link}")
-                    title = ""
-
-                try:  # Extract the URL description.
-                    description = a.parent.parent.contents[1].get_text()
-                    if description == "": # Sometimes Google returns different structures.
-                        description = a.parent.parent.contents[2].get_text()
-                except Exception:
-                    ROOT_LOGGER.warning(f"No description for link: {link}")
-                    description = ""
-
-            # Check if URL has already been found.
-            if link not in prev_results_ref+results:
-                link_rank = len(prev_results_ref)+len(results) # Approximate rank according to yagooglesearch.
-                ROOT_LOGGER.info(f"Found unique URL #{link_rank+1}: {link}")
-                elem = { "rank": link_rank, "title": title.strip(), "description": description.strip(), "url": link} \
-                    if self.verbose_output else link
-                results.append(elem)
-            else:
+            # Check if URL has already been found, before spending any work on its title and description.
+            if link in seen_urls or link in page_urls:
                 ROOT_LOGGER.info(f"Duplicate URL found: {link}")
+                continue
+            page_urls.add(link)
+            link_rank = len(seen_urls)+len(results) # Approximate rank according to yagooglesearch.
+            ROOT_LOGGER.info(f"Found unique URL #{link_rank+1}: {link}")
+
+            if not self.verbose_output:
+                results.append(link)
+                continue
+
+            try:
+                title = a.text_content() # Extract the URL title.
+            except Exception:
+                ROOT_LOGGER.warning(f"No title for link: {link}")
+                title = ""
+
+            try:  # Extract the URL description.
+                container = a.getparent().getparent()
+                description = "".join(self.DESCRIPTION_XPATH(container))
+                if description == "": # Without the known description classes, fall back to the sibling elements.
+                    description = container[1].text_content() or container[2].text_content()
+            except Exception:
+                ROOT_LOGGER.warning(f"No description for link: {link}")
+                description = ""
+
+            results.append({"rank": link_rank, "title": title.strip(), "description": description.strip(), "url": link})
 
         return results
 
     def sleep_against_429(self):
         if self.last_webcalls < self.webcalls:  # we use this to check if something came from cache or not
             # Randomize sleep time between paged requests to make it look more human.
-            random_sleep_time = random.choice(range(self.min_request_delay, self.min_request_delay + 11))
-            ROOT_LOGGER.info(f"Sleeping {random_sleep_time} seconds until retrieving the next google-page...")
-            for _ in range(random_sleep_time):
-                if self.globally_killed:
+            random_sleep_time = random.randrange(self.min_request_delay, self.min_request_delay + 11)
+            # Time since the last request (e.g. while the caller was busy with the results) counts towards the delay.
+            remaining_sleep_time = random_sleep_time - (time.monotonic() - self.last_request_time)
+            if remaining_sleep_time > 0:
+                ROOT_LOGGER.info(f"Sleeping {remaining_sleep_time:.1f} seconds until retrieving the next google-page...")
+                if self.global_kill_event.wait(timeout=remaining_sleep_time):  # Returns early (True) once all searches are killed.
                     return
-                time.sleep(1)
             self.last_webcalls = self.webcalls
 
     @property
     def globally_killed(self):
         return self.global_kill_event is not None and self.global_kill_event.is_set()
 
-    def search_gen(self, query, start=0, num=100, extra_params=None, max_result_urls=30, assign_new_ua=False):
-        """
-        :param str query: Query string.  Must NOT be url-encoded.
-        :param int start: First page of results to retrieve.
-        :param int num: Max number of results to pull back per page.  Capped at 100 by Google.
-        :param int max_result_urls: Max URLs to return for the entire Google search.
-        :param dict extra_params: A dictionary of extra HTTP GET parameters, which must be URL encoded.  For example if
-            you don't want Google to filter similar results you can set the extra_params to {'filter': '0'} which will
-            append '&filter=0' to every query.
-        """
+    def _start_search(self, query, num, extra_params, assign_new_ua):
+        """Set up a new search for search_gen / asearch_gen and return the (possibly capped) num."""
         self.query_kill_events[query] = threading.Event()  # each search has its own kill_event that stops it
 
+        # The extra parameters are the same for every page, so check them once instead of in every get_url() call.
+        self.check_extra_params(extra_params)
+
         if num > 100:
             ROOT_LOGGER.warning("The largest value allowed by Google for num is 100.  Setting num to 100.")
             num = 100
 
         self.reset_search(new_ua=assign_new_ua) # if demanded, every  new search is done with a new user-agent
+        return num
+
+    def _page_url(self, query, start, num, extra_params, search_result_list, max_result_urls):
+        """Log the progress of the search and return the URL of its next result page."""
+        ROOT_LOGGER.info(f"Stats: start={start}, num={num}, non-dup links found={len(search_result_list)}/{max_result_urls}")
+        return self.get_url(query, start=start, num=num, extra_params=extra_params)
+
+    def _page_end_reason(self, query, new_results):
+        """Why the search ends with the page that returned new_results, or None if it goes on."""
+        if new_results == ["HTTP_429_DETECTED"]:
+            # this happens only if yagooglesearch_manages_429 == False
+            return "HTTP_429_DETECTED"
+        elif new_results == ["THIS_SEARCH_KILLED"]:
+            return "THIS_SEARCH_KILLED"
+        elif not new_results:
+            if self.globally_killed:  # get_page returns nothing once all searches are killed.
+                return self._kill_reason(query)
+            # Determining if a "Next" URL page of results is not straightforward. If no valid links are found, the search results have been exhausted.
+            ROOT_LOGGER.info("No valid search results found on this page. Returning.")
+            return "SEARCH_EXHAUSTED"
+        return None
+
+    def _add_result(self, elem, search_result_list, seen_urls, max_result_urls):
+        """Add a new result to the search's bookkeeping and return whether max_result_urls is reached."""
+        search_result_list.append(elem)
+        seen_urls.add(elem["url"] if self.verbose_output else elem)
+        if max_result_urls <= len(search_result_list):
+            # If we reached the limit of requested URLs, return with the results.
+            ROOT_LOGGER.info("returning because max_result_urls reached")
+            return True
+        return False
+
+    def _kill_reason(self, query):
+        """Why the search is stopped from outside, or None if it goes on."""
+        if self.globally_killed:
+            ROOT_LOGGER.info("returning because of global kill-event")
+            return "ALL_SEARCHES_KILLED"
+        if self.search_ended(query):
+            # will likely never get here bc then we also get the "THIS_SEARCH_KILLED" as new_results
+            ROOT_LOGGER.info(f"returning because of kill-event for query `{query}`")
+            return "THIS_SEARCH_KILLED"
+        return None
+
+    def search_gen(self, query, start=0, num=100, extra_params=None, max_result_urls=30, assign_new_ua=False):
+        """
+        :param str query: Query string.  Must NOT be url-encoded.
+        :param int start: First page of results to retrieve.
+        :param int num: Max number of results to pull back per page.  Capped at 100 by Google.
+        :param int max_result_urls: Max URLs to return for the entire Google search.
+        :param dict extra_params: A dictionary of extra HTTP GET parameters.  Must NOT be url-encoded, the keys and
+            values are encoded like the query.  For example if you don't want Google to filter similar results you can set
+            the extra_params to {'filter': '0'} which will append '&filter=0' to every query.
+        """
+        extra_params = extra_params or {}
+        num = self._start_search(query, num, extra_params, assign_new_ua)
         search_result_list = [] # Consolidate search results.
+        seen_urls = set() # URLs in search_result_list, for constant-time duplicate checks.
 
         pagenum = 0
         # Loop until we reach the maximum result results found or there are no more search results found to reach max_result_urls.
         while len(search_result_list) <= max_result_urls:
+            url = self._page_url(query, start, num, extra_params, search_result_list, max_result_urls)
+            new_results = self.results_from_url(url, seen_urls=seen_urls, query=query, pagenum=pagenum)
 
-            ROOT_LOGGER.info(f"Stats: start={start}, num={num}, non-dup links found={len(search_result_list)}/{max_result_urls}")
-
-            url = self.get_url(query, start=start, num=num, extra_params=extra_params)
-            new_results = self.results_from_url(url, prev_results_ref=search_result_list, query=query, pagenum=pagenum)
-
-            if new_results == ["HTTP_429_DETECTED"]:
-                # this happens only if yagooglesearch_manages_429 == False
+            end_reason = self._page_end_reason(query, new_results)
+            if end_reason == "HTTP_429_DETECTED":
                 search_result_list.append("HTTP_429_DETECTED")
                 yield "HTTP_429_DETECTED"  # TODO this is what effing exceptions are for
-                return "HTTP_429_DETECTED"
-            elif new_results == ["THIS_SEARCH_KILLED"]:
-                return "THIS_SEARCH_KILLED"
-            elif not new_results:
-                # Determining if a "Next" URL page of results is not straightforward. If no valid links are found, the search results have been exhausted.
-                ROOT_LOGGER.info("No valid search results found on this page. Returning.")
-                return "SEARCH_EXHAUSTED"
+            if end_reason is not None:
+                return end_reason
 
             for elem in new_results:
-                search_result_list.append(elem)
+                max_reached = self._add_result(elem, search_result_list, seen_urls, max_result_urls)
                 yield elem
-                if max_result_urls <= len(search_result_list):
-                    # If we reached the limit of requested URLs, return with the results.
-                    ROOT_LOGGER.info("returning because max_result_urls reached")
+                if max_reached:
                     return "MAX_RESULTS_REACHED"
 
             start += num  # Bump the starting page URL parameter for the next request.
@@ -598,13 +823,55 @@ class SearchClient:
 
             # self.sleep_against_429()  # superflous in multi-threading-contexts - maybe useful if we have params for this to be single-threaded
 
-            if self.globally_killed:
-                ROOT_LOGGER.info("returning because of global kill-event")
-                return "ALL_SEARCHES_KILLED"
-            if self.search_ended(query):
-                # will likely never get here bc then we also get the "THIS_SEARCH_KILLED" as new_results
-                ROOT_LOGGER.info(f"returning because of kill-event for query `{query}`")
-                return "THIS_SEARCH_KILLED"
+            end_reason = self._kill_reason(query)
+            if end_reason is not None:
+                return end_reason
+
+        ROOT_LOGGER.info("returning because at the end")
+        return "GENERATOR_END"
+
+    async def asearch_gen(self, query, start=0, num=100, extra_params=None, max_result_urls=30, assign_new_ua=False):
+        """Async generator version of search_gen, with the same parameters.  Many searches can be run concurrently on one
+        event loop (e.g. with asyncio.gather), they all share this client's page-getter thread and its delays.  As async
+        generators can't return a value, the reason for ending the search is only logged."""
+        extra_params = extra_params or {}
+        num = self._start_search(query, num, extra_params, assign_new_ua)
+        search_result_list = [] # Consolidate search results.
+        seen_urls = set() # URLs in search_result_list, for constant-time duplicate checks.
+
+        pagenum = 0
+        while len(search_result_list) <= max_result_urls:
+            url = self._page_url(query, start, num, extra_params, search_result_list, max_result_urls)
+            new_results = await self.aresults_from_url(url, seen_urls=seen_urls, query=query, pagenum=pagenum)
+
+            end_reason = self._page_end_reason(query, new_results)
+            if end_reason == "HTTP_429_DETECTED":
+                yield "HTTP_429_DETECTED"
+            if end_reason is not None:
+                return
+
+            for elem in new_results:
+                max_reached = self._add_result(elem, search_result_list, seen_urls, max_result_urls)
+                yield elem
+                if max_reached:
+                    return
+
+            start += num  # Bump the starting page URL parameter for the next request.
+            pagenum += 1
+
+            if self._kill_reason(query) is not None:
+                return
 
         ROOT_LOGGER.info("returning because at the end")
-        return "GENERATOR_END"
\ No newline at end of file
+
+    async def asearch(self, queries, max_concurrent_searches=4, **kwargs):
+        """Run the searches for several queries concurrently on the current event loop, at most max_concurrent_searches
+        at a time, and return a dict with the list of results per query.  Further keyword arguments are passed on to
+        asearch_gen."""
+        semaphore = asyncio.BoundedSemaphore(max_concurrent_searches)
+
+        async def collect(query):
+            async with semaphore:
+                return [elem async for elem in self.asearch_gen(query, **kwargs)]
+
+        return dict(zip(queries, await asyncio.gather(*(collect(query) for query in queries))))